@@ -21,7 +21,6 @@ from PyQt6.QtWidgets import (
     QLineEdit, QLabel, QPushButton, QFrame, QMessageBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, pyqtSlot
-from PyQt6.QtGui import QFont
 
 from src.core.process_manager import AdvancedProcessManager
 from src.core.docker_runner import get_docker_command, is_container_running
@@ -472,7 +471,7 @@ class SentinelMainWindow(QMainWindow):
         
         # Komut gösterimi
         target = self._target_input.text().strip()
-        args_display = [arg.replace("{target}", target) if target else arg for arg in cmd.arguments]
+        args_display = cmd.render_arguments(target)
         full_command = f"{cmd.tool} {' '.join(args_display)}"
         self._command_display.setText(f"$ {full_command}")
         
@@ -508,7 +507,7 @@ class SentinelMainWindow(QMainWindow):
         target = self._target_input.text().strip()
         
         # Hedef placeholder'ı değiştir
-        args = [arg.replace("{target}", target) if target else arg for arg in cmd.arguments]
+        args = cmd.render_arguments(target)
         
         # Docker'da mı çalıştıracağız?
         if is_container_running():
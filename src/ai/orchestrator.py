@@ -8,22 +8,30 @@
 import os
 import json
 import re
+from functools import cache
 from typing import Optional, Tuple
 from openai import OpenAI
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
 from src.ai.schemas import (
     ToolCommand,
     AIResponse,
-    RiskLevel,
     validate_command,
-    get_openai_response_format,
-    TOOL_COMMAND_SCHEMA
+    validate_response_json,
+    get_openai_response_format
 )
 
 # .env dosyasını yükle
 load_dotenv()
 
+# Ortam değişkenleri modül yüklenirken bir kez okunur (yenilemek için: refresh_env)
+_OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+_LLAMA_SERVICE_URL: str = os.getenv("LLAMA_SERVICE_URL", "http://localhost:8001")
+
+# LLM yanıtındaki markdown JSON bloğu (```json { ... } ```)
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```")
+
 
 class AIOrchestrator:
     """
@@ -84,11 +92,32 @@ KURALLAR:
 - Belirsiz taleplerde needs_clarification=true dön
 - Her zaman geçerli JSON formatında yanıt ver"""
 
+    # Local model için JSON format talimatı (kullanıcı mesajına eklenir)
+    LOCAL_JSON_INSTRUCTION = """
+
+YANIT FORMATI (STRICT JSON):
+{
+    "command": {
+        "tool": "araç_adı",
+        "arguments": ["arg1", "arg2"],
+        "requires_root": false,
+        "risk_level": "low|medium|high",
+        "explanation": "açıklama"
+    },
+    "message": "kullanıcıya mesaj",
+    "needs_clarification": false
+}
+
+Eğer komut üretemiyorsan command=null yap."""
+
+    # Sistem mesajı tüm çağrılarda paylaşılır - DEĞİŞTİRİLMEMELİ
+    _SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
     def __init__(self):
         """
         Orchestrator'ı başlat.
         
-        Environment variables:
+        Environment variables (modül yüklenirken okunur):
         - OPENAI_API_KEY: Cloud AI için
         - LLAMA_SERVICE_URL: Local LLM endpoint (default: http://localhost:8001)
         """
@@ -96,12 +125,12 @@ KURALLAR:
         self._local_client: Optional[OpenAI] = None
         
         # Cloud client (OpenAI)
-        openai_key = os.getenv("OPENAI_API_KEY")
+        openai_key = _OPENAI_API_KEY
         if openai_key and openai_key != "your_openai_api_key_here":
             self._cloud_client = OpenAI(api_key=openai_key)
         
         # Local client (Ollama - OpenAI compatible API)
-        llama_url = os.getenv("LLAMA_SERVICE_URL", "http://localhost:8001")
+        llama_url = _LLAMA_SERVICE_URL
         self._local_client = OpenAI(
             base_url=f"{llama_url}/v1",
             api_key="ollama"  # Ollama requires a dummy key
@@ -214,7 +243,7 @@ KURALLAR:
             context = f"Hedef: {target}\n\nTalep: {user_input}"
         
         messages = [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
+            self._SYSTEM_MESSAGE,
             {"role": "user", "content": context}
         ]
         
@@ -259,25 +288,12 @@ KURALLAR:
         
         Ollama OpenAI-compatible API kullanır.
         """
-        # Local model için JSON talimatı ekle
-        json_instruction = """
-
-YANIT FORMATI (STRICT JSON):
-{
-    "command": {
-        "tool": "araç_adı",
-        "arguments": ["arg1", "arg2"],
-        "requires_root": false,
-        "risk_level": "low|medium|high",
-        "explanation": "açıklama"
-    },
-    "message": "kullanıcıya mesaj",
-    "needs_clarification": false
-}
-
-Eğer komut üretemiyorsan command=null yap."""
-        
-        messages[-1]["content"] += json_instruction
+        # Local model için JSON talimatı ekle (gelen listeyi değiştirmeden)
+        user_message = messages[-1]
+        messages = messages[:-1] + [{
+            "role": user_message["role"],
+            "content": user_message["content"] + self.LOCAL_JSON_INSTRUCTION
+        }]
         
         response = self._local_client.chat.completions.create(
             model="llama3:8b-instruct-q4_K_M",
@@ -296,9 +312,7 @@ Eğer komut üretemiyorsan command=null yap."""
         Bu fonksiyon nested bracket'ları düzgün handle eder.
         """
         # Markdown code block kontrolü
-        import re
-        pattern = r"```(?:json)?\s*(\{[\s\S]*?\})\s*```"
-        match = re.search(pattern, text)
+        match = _JSON_BLOCK_RE.search(text)
         if match:
             return match.group(1).strip()
         
@@ -334,6 +348,13 @@ Eğer komut üretemiyorsan command=null yap."""
             # JSON'u text içinden çıkar
             json_str = self._extract_json(raw_response)
             
+            # Cloud (strict mode) yanıtı şemaya birebir uyar: tek adımda parse + doğrula
+            if engine == "cloud":
+                try:
+                    return validate_response_json(json_str)
+                except ValidationError:
+                    pass  # Şemaya uymadı, aşağıdaki esnek yola düş
+            
             # JSON parse
             data = json.loads(json_str)
             
@@ -376,12 +397,12 @@ Eğer komut üretemiyorsan command=null yap."""
             "local": {
                 "available": self._local_available,
                 "model": "llama3",
-                "url": os.getenv("LLAMA_SERVICE_URL", "http://localhost:8001")
+                "url": _LLAMA_SERVICE_URL
             },
             "cloud": {
                 "available": self._cloud_available,
                 "model": "gpt-4o-mini",
-                "configured": os.getenv("OPENAI_API_KEY") is not None
+                "configured": _OPENAI_API_KEY is not None
             }
         }
 
@@ -390,23 +411,33 @@ Eğer komut üretemiyorsan command=null yap."""
 # Convenience Functions
 # =============================================================================
 
-_orchestrator: Optional[AIOrchestrator] = None
+def refresh_env() -> None:
+    """
+    Önbelleğe alınmış ortam değişkenlerini yeniden oku.
+    
+    Not: Mevcut orchestrator'ın client'ları yeniden oluşturulmaz;
+    yeni değerler sonraki AIOrchestrator() örneğinde geçerli olur
+    (singleton için: get_orchestrator.cache_clear()).
+    """
+    global _OPENAI_API_KEY, _LLAMA_SERVICE_URL
+    _OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    _LLAMA_SERVICE_URL = os.getenv("LLAMA_SERVICE_URL", "http://localhost:8001")
 
 
+@cache
 def get_orchestrator() -> AIOrchestrator:
     """
     Singleton orchestrator instance döndür.
     
+    İlk çağrıdan sonra functools.cache üzerinden tek lookup ile döner.
+    
     Kullanım:
         from src.ai.orchestrator import get_orchestrator
         
         orch = get_orchestrator()
         response = orch.process("Ağı tara", target="192.168.1.0/24")
     """
-    global _orchestrator
-    if _orchestrator is None:
-        _orchestrator = AIOrchestrator()
-    return _orchestrator
+    return AIOrchestrator()
 
 
 def quick_command(user_input: str, target: Optional[str] = None) -> Optional[ToolCommand]:
@@ -2,12 +2,13 @@
 # Sprint 2.1: AI yanıt formatları
 # OpenAI response_format uyumlu, strict=True için tasarlandı
 
-from pydantic import BaseModel, Field
-from typing import List, Literal, Optional
-from enum import Enum
+from functools import cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional, Union
+from enum import StrEnum
 
 
-class RiskLevel(str, Enum):
+class RiskLevel(StrEnum):
     """
     Komut risk seviyeleri.
     
@@ -20,6 +21,25 @@ class RiskLevel(str, Enum):
     HIGH = "high"
 
 
+# ToolCommand JSON şeması örnekleri (schema üretiminde yeniden kurulmaz)
+_TOOL_COMMAND_EXAMPLES = [
+    {
+        "tool": "nmap",
+        "arguments": ["-sn", "192.168.1.0/24"],
+        "requires_root": False,
+        "risk_level": "low",
+        "explanation": "Ağdaki aktif hostları keşfetmek için ping taraması"
+    },
+    {
+        "tool": "nmap",
+        "arguments": ["-sS", "-sV", "-p-", "192.168.1.100"],
+        "requires_root": True,
+        "risk_level": "medium",
+        "explanation": "Hedef üzerinde tüm portları ve servisleri tespit etmek için SYN taraması"
+    }
+]
+
+
 class ToolCommand(BaseModel):
     """
     AI'ın ürettiği komut şeması.
@@ -67,25 +87,19 @@ class ToolCommand(BaseModel):
         description="AI'ın bu komutu neden önerdiğine dair kısa açıklama"
     )
     
-    class Config:
-        json_schema_extra = {
-            "examples": [
-                {
-                    "tool": "nmap",
-                    "arguments": ["-sn", "192.168.1.0/24"],
-                    "requires_root": False,
-                    "risk_level": "low",
-                    "explanation": "Ağdaki aktif hostları keşfetmek için ping taraması"
-                },
-                {
-                    "tool": "nmap",
-                    "arguments": ["-sS", "-sV", "-p-", "192.168.1.100"],
-                    "requires_root": True,
-                    "risk_level": "medium",
-                    "explanation": "Hedef üzerinde tüm portları ve servisleri tespit etmek için SYN taraması"
-                }
-            ]
-        }
+    def render_arguments(self, target: Optional[str] = None) -> List[str]:
+        """
+        {target} placeholder'ı çözülmüş argüman listesini döndür.
+        
+        Hedef verilmemişse argümanlar olduğu gibi (yeni liste) döner.
+        """
+        if not target:
+            return list(self.arguments)
+        return [arg.replace("{target}", target) for arg in self.arguments]
+    
+    model_config = ConfigDict(
+        json_schema_extra={"examples": _TOOL_COMMAND_EXAMPLES}
+    )
 
 
 class AIResponse(BaseModel):
@@ -198,6 +212,9 @@ class SuggestionSchema(BaseModel):
     - SSH açık → "Hydra ile brute force dene"
     """
     
+    # Başlangıçta kullanılmıyor: şema ilk doğrulamada kurulur
+    model_config = ConfigDict(defer_build=True)
+    
     related_finding_id: Optional[str] = Field(
         default=None,
         description="Bu önerinin dayandığı bulgu ID'si"
@@ -236,6 +253,8 @@ class SuggestionSchema(BaseModel):
 class SuggestionList(BaseModel):
     """Birden fazla öneri içeren liste."""
     
+    model_config = ConfigDict(defer_build=True)
+    
     suggestions: List[SuggestionSchema] = Field(
         default_factory=list,
         description="Öneri listesi"
@@ -251,6 +270,11 @@ class SuggestionList(BaseModel):
 # Yardımcı Fonksiyonlar
 # =============================================================================
 
+# Modül yüklenirken bir kez kurulur, doğrulama doğrudan pydantic-core'a gider
+_TOOL_COMMAND_ADAPTER = TypeAdapter(ToolCommand)
+_AI_RESPONSE_ADAPTER = TypeAdapter(AIResponse)
+
+
 def validate_command(data: dict) -> ToolCommand:
     """
     AI yanıtını doğrula ve ToolCommand objesine çevir.
@@ -258,13 +282,64 @@ def validate_command(data: dict) -> ToolCommand:
     Raises:
         ValidationError: Şema uyumsuzluğunda
     """
-    return ToolCommand.model_validate(data)
+    return _TOOL_COMMAND_ADAPTER.validate_python(data)
+
+
+def validate_command_json(raw: Union[str, bytes]) -> ToolCommand:
+    """
+    Ham JSON komutunu tek adımda parse et ve doğrula.
+    
+    json.loads + validate_command yerine kullanılır (ara dict oluşmaz).
+    
+    Raises:
+        ValidationError: Geçersiz JSON veya şema uyumsuzluğunda
+    """
+    return _TOOL_COMMAND_ADAPTER.validate_json(raw)
+
+
+def validate_response_json(raw: Union[str, bytes]) -> AIResponse:
+    """
+    AI_RESPONSE_SCHEMA'ya uyan ham JSON yanıtını tek adımda parse et ve doğrula.
+    
+    OpenAI strict mode çıktısı için uygundur (tüm alanlar zorunlu).
+    
+    Raises:
+        ValidationError: Geçersiz JSON veya şema uyumsuzluğunda
+    """
+    return _AI_RESPONSE_ADAPTER.validate_json(raw)
+
+
+@cache
+def _suggestion_list_adapter() -> TypeAdapter:
+    """Öneri listesi adapter'ı (SuggestionSchema ertelendiği için ilk kullanımda kurulur)."""
+    return TypeAdapter(List[SuggestionSchema])
+
+
+def validate_suggestions(items: List[dict]) -> List[SuggestionSchema]:
+    """
+    Öneri listesini tek çağrıda doğrula.
+    
+    Liste pydantic-core'a bir kerede verilir (öğe başına model __init__ yok).
+    
+    Raises:
+        ValidationError: Herhangi bir öneri şemaya uymazsa
+    """
+    return _suggestion_list_adapter().validate_python(items)
+
+
+# response_format modül yüklenirken bir kez kurulur - DEĞİŞTİRİLMEMELİ
+_OPENAI_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": AI_RESPONSE_SCHEMA
+}
 
 
 def get_openai_response_format() -> dict:
     """
     OpenAI API için response_format parametresi.
     
+    Her çağrıda aynı (paylaşılan) dict döner.
+    
     Kullanım:
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -272,8 +347,5 @@ def get_openai_response_format() -> dict:
             response_format=get_openai_response_format()
         )
     """
-    return {
-        "type": "json_schema",
-        "json_schema": AI_RESPONSE_SCHEMA
-    }
+    return _OPENAI_RESPONSE_FORMAT
 
@@ -4,21 +4,150 @@
 # Bu modül, güvenlik araçlarını Docker container içinde çalıştırır.
 # Container: sentinel-tools (Ubuntu + Nmap, Gobuster, Nikto, Hydra)
 
+import http.client
+import json
+import os
+import socket
 import subprocess
-from typing import List, Tuple, Optional
+import time
+from typing import List, Optional, Tuple
 
 
 CONTAINER_NAME = "sentinel-tools"
 
+# Varsayılan Docker Engine API soketi (Linux); erişilemezse docker CLI kullanılır
+DOCKER_SOCKET_PATH = "/var/run/docker.sock"
+
+# Container'da varlığı kontrol edilen araçlar
+KNOWN_TOOLS = ("nmap", "gobuster", "nikto", "hydra", "sqlmap", "dirb", "whois", "dig")
+
+# Tek docker exec içinde tüm araçları yoklayan betik (araç adları "$@" ile verilir)
+_TOOL_PROBE_SCRIPT = 'for t in "$@"; do command -v "$t" >/dev/null 2>&1 && echo "$t"; done'
+
+# Container durumunun önbellekte tutulma süresi (saniye)
+CONTAINER_CHECK_TTL = 2.0
+
+_container_checked_at: Optional[float] = None
+_container_running: bool = False
+
 
 def is_container_running() -> bool:
     """
     sentinel-tools container'ının çalışıp çalışmadığını kontrol et.
     
+    Sonuç CONTAINER_CHECK_TTL süresince önbellekte tutulur; bu sürede
+    tekrarlanan çağrılar docker CLI'ı yeniden çalıştırmaz.
+    
     Returns:
         True: Container çalışıyor
         False: Container çalışmıyor veya yok
     """
+    global _container_checked_at, _container_running
+    
+    now = time.monotonic()
+    if _container_checked_at is not None and now - _container_checked_at < CONTAINER_CHECK_TTL:
+        return _container_running
+    
+    running = _query_container_running_socket()
+    if running is None:
+        running = _inspect_container_running()
+    
+    _container_running = running
+    _container_checked_at = now
+    return _container_running
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """Unix soket üzerinden HTTP bağlantısı (Docker Engine API için)."""
+    
+    def __init__(self, socket_path: str, timeout: float = 2.0):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+    
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def _active_docker_context() -> Optional[str]:
+    """docker CLI'ın aktif context adı (DOCKER_CONTEXT veya config.json currentContext)."""
+    context = os.environ.get("DOCKER_CONTEXT")
+    if context:
+        return context
+    
+    config_dir = os.environ.get("DOCKER_CONFIG") or os.path.join(os.path.expanduser("~"), ".docker")
+    try:
+        with open(os.path.join(config_dir, "config.json"), encoding="utf-8") as f:
+            return json.load(f).get("currentContext")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _docker_socket_path() -> Optional[str]:
+    """
+    docker CLI'ın konuştuğu daemon'un Unix soket yolunu bul.
+    
+    Komutlar docker CLI ile çalıştırıldığı için durum sorgusu da aynı daemon'a gitmeli.
+    
+    Returns:
+        Soket yolu veya None (DOCKER_HOST unix:// değil ya da varsayılan dışı
+        bir context aktif - rootless, Docker Desktop, Podman vb.; CLI kullanılmalı)
+    """
+    docker_host = os.environ.get("DOCKER_HOST")
+    if docker_host:
+        if docker_host.startswith("unix://"):
+            return docker_host[len("unix://"):]
+        return None
+    
+    if _active_docker_context() not in (None, "default"):
+        return None
+    
+    return DOCKER_SOCKET_PATH
+
+
+def _query_container_running_socket() -> Optional[bool]:
+    """
+    Container durumunu doğrudan Docker Engine API'den oku (docker CLI başlatılmaz).
+    
+    Returns:
+        True/False: Container durumu
+        None: Soket kullanılamıyor veya kesin sonuç yok (Windows, izin yok,
+              container bulunamadı vb.) - CLI'a düşülmeli
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    
+    socket_path = _docker_socket_path()
+    if socket_path is None or not os.path.exists(socket_path):
+        return None
+    
+    conn = _UnixHTTPConnection(socket_path)
+    try:
+        conn.request("GET", f"/containers/{CONTAINER_NAME}/json")
+        response = conn.getresponse()
+        body = response.read()
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+    
+    if response.status != 200:
+        return None  # 404 dahil: farklı bir daemon olabilir, kararı CLI versin
+    
+    try:
+        return json.loads(body)["State"]["Running"] is True
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _inspect_container_running() -> bool:
+    """docker inspect ile container durumunu sorgula (önbelleksiz)."""
     try:
         result = subprocess.run(
             ["docker", "inspect", "-f", "{{.State.Running}}", CONTAINER_NAME],
@@ -66,13 +195,17 @@ def run_command_sync(tool: str, args: List[str], timeout: int = 300) -> Tuple[in
     command, docker_args = get_docker_command(tool, args)
     
     try:
+        # Çıktı byte olarak okunur, tek seferde decode edilir (büyük nmap çıktıları)
         result = subprocess.run(
             [command] + docker_args,
             capture_output=True,
-            text=True,
             timeout=timeout
         )
-        return (result.returncode, result.stdout, result.stderr)
+        return (
+            result.returncode,
+            result.stdout.decode("utf-8", "replace"),
+            result.stderr.decode("utf-8", "replace")
+        )
     except subprocess.TimeoutExpired:
         return (-1, "", "Timeout: Komut çok uzun sürdü")
     except Exception as e:
@@ -83,25 +216,23 @@ def list_available_tools() -> List[str]:
     """
     Container'da mevcut araçları listele.
     
+    Tüm araçlar tek bir docker exec çağrısında kontrol edilir.
+    
     Returns:
-        Araç isimleri listesi
+        Araç isimleri listesi (KNOWN_TOOLS sırasıyla)
     """
-    tools = ["nmap", "gobuster", "nikto", "hydra", "sqlmap", "dirb", "whois", "dig"]
-    available = []
+    try:
+        result = subprocess.run(
+            ["docker", "exec", CONTAINER_NAME, "sh", "-c", _TOOL_PROBE_SCRIPT, "sh", *KNOWN_TOOLS],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return []  # docker yok veya exec takıldı (TimeoutExpired)
     
-    for tool in tools:
-        try:
-            result = subprocess.run(
-                ["docker", "exec", CONTAINER_NAME, "which", tool],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                available.append(tool)
-        except Exception:
-            pass
-    
-    return available
+    found = set(result.stdout.split())
+    return [tool for tool in KNOWN_TOOLS if tool in found]
 
 
 # =============================================================================
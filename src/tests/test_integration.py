@@ -14,7 +14,6 @@ from src.core.process_manager import AdvancedProcessManager
 from src.core.docker_runner import get_docker_command, is_container_running
 from src.ui.terminal_view import TerminalView
 from src.ai.orchestrator import get_orchestrator
-from src.ai.schemas import ToolCommand
 
 
 class TestWindow(QMainWindow):
@@ -98,11 +97,9 @@ class TestWindow(QMainWindow):
         if response.command:
             # Komutu çalıştır
             cmd = response.command
-            args = cmd.arguments
             
             # Hedef placeholder'ı değiştir
-            if target:
-                args = [arg.replace("{target}", target) for arg in args]
+            args = cmd.render_arguments(target)
             
             # Docker'da çalıştır
             if is_container_running():